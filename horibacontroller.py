@@ -158,6 +158,12 @@ class HoribaController:
             x = raw[0]["roi"][0]["xData"]
             y = raw[0]["roi"][0]["yData"]
 
+            # the SDK may wrap a single ROI's data in a one-element list
+            if isinstance(x, list) and len(x) == 1:
+                x = x[0]
+            if isinstance(y, list) and len(y) == 1:
+                y = y[0]
+
             return x, y
 
         except Exception as e:
@@ -182,8 +188,8 @@ class HoribaController:
 
     async def set_rotation_angle(self, value: float) -> None:
         if self.enable_rotation_stage and self.rotation_stage and self.rotation_stage.is_connected:
-            self.rotation_stage.degree = value
-            await asyncio.sleep(0.5)
+            if self.rotation_stage.move_to(value):
+                await asyncio.sleep(0.5)
             self.last_angle = value
 
     async def get_rotation_angle(self) -> float:
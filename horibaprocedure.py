@@ -119,11 +119,6 @@ class HoribaSpectrumProcedure(Procedure):
             self.controller.acquire_spectrum(**params)
         )
         
-        if isinstance(x_data, list) and len(x_data) == 1:
-            x_data = x_data[0]
-        if isinstance(y_data, list) and len(y_data) == 1:
-            y_data = y_data[0]
-        
         for x, y in zip(x_data, y_data):
             try:
                 wavenumber = (1.0 / self.excitation_wavelength - 1.0 / x) * 1e7
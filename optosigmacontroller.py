@@ -1,22 +1,33 @@
+import time
 from loguru import logger
 from optosigma import GSC01
 
 class OptoSigmaController:
+    __slots__ = (
+        'port', 'timeout', 'controller', '_is_connected', '_current_position',
+        'degree_per_pulse', 'max_degree', '_pulses_per_rev',
+        '_pos_cache_ts', '_pos_cache_ttl',
+    )
+
     def __init__(self, port: str = "COM3", timeout: int = 1):
         self.port = port
         self.timeout = timeout
         self.controller = None
         self._is_connected = False
         self._current_position = 0  
+        self._pos_cache_ts = 0.0
+        self._pos_cache_ttl = 0.05  # [s] reuse a position read this fresh; 0.0 ts = unknown
         
         # OSMS-60YAW specifications
         self.degree_per_pulse = 0.0025  # [deg/pulse] for OSMS-60YAW
         self.max_degree = 360.0
+        self._pulses_per_rev = int(round(self.max_degree / self.degree_per_pulse))
         
     def connect(self):
         try:
             self.controller = GSC01(self.port, timeout=self.timeout)
             self._is_connected = True
+            self._pos_cache_ts = 0.0
             logger.info(f"connected to OptoSigma stage on {self.port}")
             
             # Get current position
@@ -40,8 +51,12 @@ class OptoSigmaController:
     
     def _update_current_position(self):
         if self._is_connected and self.controller:
+            now = time.monotonic()
+            if now - self._pos_cache_ts < self._pos_cache_ttl:
+                return
             try:
                 self._current_position = self.controller.position
+                self._pos_cache_ts = now
             except Exception as e:
                 logger.error(f"Failed to read position: {str(e)}")
     
@@ -51,43 +66,56 @@ class OptoSigmaController:
     
     @property
     def degree(self) -> float:
-        if not self.is_connected:
-            return 0.0
-        try:
-            self._update_current_position()
-            deg = (self._current_position % (self.max_degree / self.degree_per_pulse)) * self.degree_per_pulse
-            return deg
-        except Exception as e:
-            logger.error(f"failed to get degree: {str(e)}")
+        if self.controller is None or not self._is_connected:
             return 0.0
+        # the serial read is the only call that can fail and
+        # _update_current_position already handles that
+        self._update_current_position()
+        return (self._current_position % self._pulses_per_rev) * self.degree_per_pulse
     
     @degree.setter
     def degree(self, target_degree: float):
-        if not self.is_connected:
+        self.move_to(target_degree)
+    
+    def move_to(self, target_degree: float) -> bool:
+        """Move to target_degree; returns False when no move was issued"""
+        ctrl = self.controller
+        if ctrl is None or not self._is_connected:
             logger.error("cannot set degree - stage not connected")
-            return
+            return False
         
         try:
             target_degree = target_degree % self.max_degree
             
             target_position = int(target_degree / self.degree_per_pulse)
             
-            logger.debug(f"moving rotation stage to {target_degree:.2f} degrees ({target_position} pulses)")
+            # a zero timestamp means the position is not known to be current
+            if self._pos_cache_ts and target_position == self._current_position:
+                return False
             
-            self.controller.position = target_position
-            self.controller.sleep_until_stop()
+            logger.debug("moving rotation stage to {:.2f} degrees ({} pulses)", target_degree, target_position)
+            
+            ctrl.position = target_position
+            self._sleep_until_stop(ctrl)
             
             self._current_position = target_position
+            self._pos_cache_ts = time.monotonic()
             
-            logger.info(f"rotation stage moved to {target_degree:.2f} degrees")
+            logger.info("rotation stage moved to {:.2f} degrees", target_degree)
             
         except Exception as e:
+            self._pos_cache_ts = 0.0
             logger.error(f"failed to set degree: {str(e)}")
+        return True
     
     def move_relative(self, delta_degree: float):
-        current = self.degree
-        target = current + delta_degree
-        self.degree = target
+        # base the move on the last known position when it is trusted so a
+        # relative move costs one serial move instead of a read plus a move
+        if self._pos_cache_ts:
+            current = (self._current_position % self._pulses_per_rev) * self.degree_per_pulse
+        else:
+            current = self.degree
+        self.degree = current + delta_degree
     
     def return_to_origin(self):
         if not self.is_connected:
@@ -97,39 +125,54 @@ class OptoSigmaController:
         try:
             logger.info("returning rotation stage to origin...")
             self.controller.return_origin()
-            self.controller.sleep_until_stop()
+            self._sleep_until_stop(self.controller)
             self._current_position = 0
+            self._pos_cache_ts = time.monotonic()
             logger.info("rotation stage returned to origin")
         except Exception as e:
+            self._pos_cache_ts = 0.0
             logger.error(f"failed to return to origin: {str(e)}")
     
     def stop(self):
         if self.is_connected:
             try:
                 self.controller.stop()
+                self._pos_cache_ts = 0.0
                 logger.info("rotation stage stopped")
             except Exception as e:
                 logger.error(f"failed to stop stage: {str(e)}")
     
     @property
     def is_busy(self) -> bool:
-        if not self.is_connected:
+        ctrl = self.controller
+        if ctrl is None or not self._is_connected:
             return False
         try:
-            return not self.controller.is_ready
+            return not ctrl.is_ready
         except Exception as e:
             logger.error(f"failed to check busy status: {str(e)}")
             return False
     
+    def _sleep_until_stop(self, ctrl, max_interval: float = 0.1):
+        # short moves finish in a few ms; back off so long moves don't
+        # flood the serial line with status queries
+        interval = 0.005
+        while not ctrl.is_ready:
+            time.sleep(interval)
+            interval = min(interval * 1.5, max_interval)
+    
     def wait_until_ready(self):
-        if self.is_connected:
+        ctrl = self.controller
+        if ctrl is not None and self._is_connected:
             try:
-                self.controller.sleep_until_stop()
+                self._sleep_until_stop(ctrl)
+                self._pos_cache_ts = 0.0
             except Exception as e:
                 logger.error(f"error waiting for stage: {str(e)}")
     
     def get_status(self) -> dict:
-        if not self.is_connected:
+        ctrl = self.controller
+        if ctrl is None or not self._is_connected:
             return {"connected": False}
         
         try:
@@ -138,7 +181,7 @@ class OptoSigmaController:
                 "position_pulses": self._current_position,
                 "degree": self.degree,
                 "is_busy": self.is_busy,
-                "is_ready": self.controller.is_ready if self.controller else False
+                "is_ready": ctrl.is_ready
             }
         except Exception as e:
             logger.error(f"failed to get status: {str(e)}")
@@ -3,6 +3,7 @@ import os
 import asyncio
 import threading
 import time
+import functools
 from loguru import logger
 
 from PyQt5 import QtWidgets, QtCore
@@ -25,10 +26,57 @@ except ImportError:
     print("could not import 'horibacontroller.py' or 'horibaprocedure.py'. place rtc.py in the same directory as these files.")
     sys.exit(1)
 
+# GUI label -> SDK int for every enum-backed parameter, built once at import
+_LOOKUP = {
+    'grating': {k: v.value for k, v in GRATING_CHOICES.items()},
+    **{name: {k: v.value for k, v in choices.items()} for name, choices in PARAM_MAP.items()},
+}
+
+
+class SpectrumRing:
+    """
+    single-producer/single-consumer ring of the latest (x, y) spectra.
+    the scan coroutine only advances head, the GUI only advances tail,
+    so no lock is needed; stale frames are overwritten, never queued.
+    each slot owns a float32 intensity buffer that is refilled in place;
+    the wavelength axis is shared by reference since it rarely changes.
+    """
+    __slots__ = ('_size', '_x_refs', '_y_bufs', '_head', '_tail')
+
+    def __init__(self, size: int = 4):
+        self._size = size
+        self._x_refs = [None] * size
+        self._y_bufs = [None] * size
+        self._head = 0
+        self._tail = 0
+
+    def push(self, x, y):
+        i = self._head % self._size
+        n = len(y)
+        if self._y_bufs[i] is None or self._y_bufs[i].size != n:
+            self._y_bufs[i] = np.empty(n, dtype=np.float32)
+        self._x_refs[i] = x
+        np.copyto(self._y_bufs[i], y)
+        self._head += 1
+
+    def pending(self) -> int:
+        return self._head - self._tail
+
+    def pop_latest(self):
+        head = self._head
+        if head == self._tail:
+            return None
+        self._tail = head
+        i = (head - 1) % self._size
+        return self._x_refs[i], self._y_bufs[i]
+
 
 class LiveViewWindow(QWidget):
-    data_ready = QtCore.pyqtSignal(object, object)  # (x_data, y_data)
     scan_error = QtCore.pyqtSignal(str)  
+    move_finished = QtCore.pyqtSignal()
+
+    PLOT_INTERVAL_MS = 33
+    ACQ_DRAIN_TIMEOUT = 5.0
 
     def __init__(self):
         super().__init__()
@@ -44,13 +92,23 @@ class LiveViewWindow(QWidget):
         except Exception as e:
             logger.error(f"Failed to initialize hardware on startup: {e}")
         
-        self.worker_thread = None
-        self.stop_event = threading.Event()
+        self._scan_future = None
+        self._acq_task = None
+        self._acq_deadline = 0.0
         self.is_scanning = False  
         
         self.latest_wavelength = None
         self.latest_intensity = None
         
+        self._ring = SpectrumRing(4)
+        self._axis = None
+        self._axis_key = None
+        self._wn_src = None
+        self._wn_excitation = None
+        self._wn_buf = None
+        self.plot_timer = QtCore.QTimer(self)
+        self.plot_timer.timeout.connect(self._poll_ring)
+        
         self.setWindowTitle("Horiba RTC")
         self.setGeometry(100, 100, 1200, 700)
         
@@ -64,7 +122,12 @@ class LiveViewWindow(QWidget):
         self.plot_widget = pg.PlotWidget()
         self.plot_item = self.plot_widget.getPlotItem()
         self.plot_item.setLabels(left='Intensity (counts)', bottom='Wavelength (nm)')
-        self.plot_data_item = self.plot_item.plot(pen='y') 
+        # cosmetic 1px pen, no NaN scan: spectra from the CCD are always finite
+        self.plot_data_item = self.plot_item.plot(
+            pen=pg.mkPen('y', width=1), connect='all', skipFiniteCheck=True
+        )
+        self.plot_data_item.setDownsampling(auto=True, method='peak')
+        self.plot_data_item.setClipToView(True)
         plot_layout.addWidget(self.plot_widget)
         plot_widget.setLayout(plot_layout)
     
@@ -105,6 +168,8 @@ class LiveViewWindow(QWidget):
         self.excitation_wavelength.setValue(532.0)
         self.excitation_wavelength.setSuffix(" nm")
 
+        self._excitation_nm = self.excitation_wavelength.value()
+        self.excitation_wavelength.valueChanged.connect(self._set_excitation)
         spec_layout.addRow("Excitation Wavelength:", self.excitation_wavelength)
 
         
@@ -201,20 +266,39 @@ class LiveViewWindow(QWidget):
         main_layout.addWidget(plot_widget, 3)    
         self.setLayout(main_layout)
         
-        self.data_ready.connect(self.update_plot)
         self.scan_error.connect(self.handle_scan_error)
+        self.move_finished.connect(self.on_move_finished)
+        
+        self._enum_cache = {}
+        self._recompute_enum_cache()
+        for combo in (self.grating_combo, self.gain_combo, self.speed_combo):
+            combo.currentIndexChanged.connect(self._recompute_enum_cache)
         logger.info("RTC GUI initialized.")
 
     def wavelength_to_wavenumber(self, wavelength_nm):
         """
         wavenumber = (1/λ_excitation - 1/λ_scattered) * 10^7
         """
-        excitation = self.excitation_wavelength.value()
+        excitation = self._excitation_nm
+        # the axis array is replaced, never mutated, so identity + excitation
+        # is enough to know the cached conversion is still valid
+        if wavelength_nm is self._wn_src and excitation == self._wn_excitation:
+            return self._wn_buf
         try:
-            wavenumber = (1.0 / excitation - 1.0 / wavelength_nm) * 1e7
-            return wavenumber
-        except (ZeroDivisionError, TypeError):
+            inv_excitation = 1.0 / excitation
+            if self._wn_buf is None or self._wn_buf.shape != wavelength_nm.shape:
+                self._wn_buf = np.empty_like(wavelength_nm)
+            np.reciprocal(wavelength_nm, out=self._wn_buf)
+            np.subtract(inv_excitation, self._wn_buf, out=self._wn_buf)
+            self._wn_buf *= 1e7
+        except (ZeroDivisionError, TypeError, AttributeError):
             return wavelength_nm 
+        self._wn_src = wavelength_nm
+        self._wn_excitation = excitation
+        return self._wn_buf
+
+    def _set_excitation(self, value):
+        self._excitation_nm = value
 
     def toggle_x_axis(self):
         if self.wavenumber_checkbox.isChecked():
@@ -226,13 +310,18 @@ class LiveViewWindow(QWidget):
             self.update_plot(self.latest_wavelength, self.latest_intensity)
 
     def enumconv(self, param_name: str, value: str):
-        if param_name == 'grating':
-            return GRATING_CHOICES[value].value
-        enum_dict = PARAM_MAP.get(param_name)
-        if enum_dict and value in enum_dict:
-            return enum_dict[value].value
-        logger.error(f"Unknown parameter or value: {param_name}={value}")
-        return None
+        try:
+            return _LOOKUP[param_name][value]
+        except KeyError:
+            logger.error(f"Unknown parameter or value: {param_name}={value}")
+            return None
+
+    def _recompute_enum_cache(self):
+        self._enum_cache = {
+            'grating': self.enumconv('grating', self.grating_combo.currentText()),
+            'gain': self.enumconv('gain', self.gain_combo.currentText()),
+            'speed': self.enumconv('speed', self.speed_combo.currentText()),
+        }
 
     def _start_event_loop(self):
         def run_loop(loop):
@@ -245,6 +334,11 @@ class LiveViewWindow(QWidget):
         logger.info("Event loop started in background thread")
 
     def run_async_task(self, task, timeout=30):
+        """Block the GUI thread on a one-shot coroutine; the scan loop awaits directly"""
+        if threading.current_thread() is self.loop_thread:
+            task.close()
+            # blocking here would deadlock the loop that has to run the task
+            raise RuntimeError("run_async_task called from the event loop thread; await the coroutine instead")
         try:
             future = asyncio.run_coroutine_threadsafe(task, self.loop)
             return future.result(timeout=timeout)
@@ -257,10 +351,10 @@ class LiveViewWindow(QWidget):
             'excitation_wavelength': self.excitation_wavelength.value(),
             'center_wavelength': self.center_wavelength.value(),
             'exposure': self.exposure.value(),
-            'grating': self.enumconv('grating', self.grating_combo.currentText()),
+            'grating': self._enum_cache['grating'],
             'slit_position': self.slit_position.value(),
-            'gain': self.enumconv('gain', self.gain_combo.currentText()),
-            'speed': self.enumconv('speed', self.speed_combo.currentText()),
+            'gain': self._enum_cache['gain'],
+            'speed': self._enum_cache['speed'],
             'rotation_angle': self.rotation_angle.value(),
             'ccd_y_origin': self.ccd_y_origin.value(),
             'ccd_y_size': self.ccd_y_size.value(),
@@ -275,11 +369,24 @@ class LiveViewWindow(QWidget):
         
         angle = self.rotation_angle.value()
         logger.info(f"Setting rotation angle to {angle}°")
+        self.set_angle_button.setEnabled(False)
+        self.start_button.setEnabled(False)
+        future = asyncio.run_coroutine_threadsafe(
+            self.controller.set_rotation_angle(angle), self.loop
+        )
+        future.add_done_callback(self._handle_angle_result)
+
+    def _handle_angle_result(self, fut):
         try:
-            self.run_async_task(self.controller.set_rotation_angle(angle))
+            fut.result()
             logger.info("Angle set.")
         except Exception as e:
             logger.error(f"Failed to set angle: {e}")
+        self.move_finished.emit()
+
+    def on_move_finished(self):
+        self.set_angle_button.setEnabled(True)
+        self.start_button.setEnabled(not self.is_scanning)
 
     def start_scan(self):
         if self.is_scanning:
@@ -291,77 +398,123 @@ class LiveViewWindow(QWidget):
         except Exception as e:
             logger.error(f"Invalid parameters: {e}")
             return
+        
+        # settings are fixed for the whole scan: resolve them once here and
+        # keep the stage angle out of the per-acquisition kwargs
+        angle = params.pop('rotation_angle')
+        params.pop('excitation_wavelength')
+        acquire = functools.partial(self.controller.acquire_spectrum, **params)
             
-        self.stop_event.clear()
         self.is_scanning = True 
-        self.worker_thread = threading.Thread(
-            target=self._scan_loop, 
-            args=(params,), 
-            daemon=True
+        self._scan_future = asyncio.run_coroutine_threadsafe(
+            self._scan_coro(angle, acquire), self.loop
         )
         
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
-        self.worker_thread.start()
+        self.plot_timer.start(self.PLOT_INTERVAL_MS)
         logger.info("Live scan started.")
 
     def stop_scan(self):
         logger.info("Stop requested by user.")
-        self.stop_event.set()
-        if self.worker_thread and self.worker_thread.is_alive():
-            self.worker_thread.join(timeout=5.0)
+        if self._scan_future and not self._scan_future.done():
+            # thread-safe: cancels the task on self.loop at its next await
+            self._scan_future.cancel()
+        self._scan_future = None
+        
+        self.plot_timer.stop()
+        self._poll_ring()
         
         self.is_scanning = False  
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         logger.info("Live scan stopped.")
 
-    def _scan_loop(self, params):
+    async def _scan_coro(self, angle, acquire):
+        # a cancelled scan leaves its last acquisition running to completion
+        # so the CCD is never abandoned mid-readout; don't start on top of it
+        task, self._acq_task = self._acq_task, None
+        if task is not None:
+            if not task.done():
+                remaining = max(0.0, self._acq_deadline - asyncio.get_running_loop().time())
+                done, _ = await asyncio.wait([task], timeout=remaining)
+                if not done:
+                    task.cancel()
+                    await asyncio.wait([task])
+                    logger.error("Previous acquisition did not finish, cancelled it")
+                    self.scan_error.emit("Previous acquisition did not finish, cancelled it")
+                    return
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(f"Previous acquisition failed: {task.exception()}")
+
         try:
-            logger.info(f"Setting angle to {params['rotation_angle']}° for scan")
-            self.run_async_task(
-                self.controller.set_rotation_angle(params['rotation_angle'])
-            )
+            # no serial move and no settle delay when the stage is trusted
+            # to already hold the target position
+            logger.info(f"Setting angle to {angle}° for scan")
+            await self.controller.set_rotation_angle(angle)
         except Exception as e:
             logger.error(f"Failed to set rotation angle: {e}")
             self.scan_error.emit(f"Failed to set rotation angle: {e}")
             return
 
+        # the wavelength axis only depends on these settings, so it is
+        # converted once and every later frame reuses the same array
+        axis_key = tuple(acquire.keywords[k] for k in (
+            'grating', 'center_wavelength', 'ccd_x_bin', 'ccd_y_origin', 'ccd_y_size'
+        ))
+
+        # same slack as the old blocking wait, on top of the exposure itself
+        acq_timeout = acquire.keywords['exposure'] + 60.0
+        plot_period = self.PLOT_INTERVAL_MS / 1000.0
+        last_emit_ts = time.perf_counter()
         acquisition_count = 0
-        while not self.stop_event.is_set():
-            try:
-                acquisition_count += 1
-                logger.info(f"Starting acquisition #{acquisition_count}")
-                start_time = time.time()
-                
-                x, y = self.run_async_task(
-                    self.controller.acquire_spectrum(**params),
-                    timeout=60 
-                )
-                
-                if isinstance(x, list) and len(x) == 1:
-                    x = x[0]
-                if isinstance(y, list) and len(y) == 1:
-                    y = y[0]
-
-                if not self.stop_event.is_set():
-                    self.data_ready.emit(x, y)
-                    logger.success(f"Acquisition #{acquisition_count} completed successfully")
-                
-                elapsed = time.time() - start_time
-                logger.debug(f"Acquisition took {elapsed:.2f}s")
-                
-                if elapsed < 0.1:
-                    time.sleep(0.1)
-                        
-            except Exception as e:
-                logger.error(f"Error in acquisition loop: {e}")
-                self.scan_error.emit(f"Acquisition error: {e}")
-                self.stop_event.set()
-                break
-        
-        logger.info(f"Scan loop finishing after {acquisition_count} acquisitions.")
-        QtCore.QTimer.singleShot(0, self.stop_scan)
+        try:
+            while True:
+                try:
+                    acquisition_count += 1
+                    logger.info("Starting acquisition #{}", acquisition_count)
+                    start_time = time.perf_counter()
+                    
+                    self._acq_deadline = asyncio.get_running_loop().time() + acq_timeout
+                    self._acq_task = asyncio.ensure_future(acquire())
+                    x, y = await asyncio.wait_for(
+                        asyncio.shield(self._acq_task), timeout=acq_timeout
+                    )
+
+                    if axis_key != self._axis_key:
+                        self._axis = np.array(x, dtype=np.float32)
+                        self._axis_key = axis_key
+
+                    self._ring.push(self._axis, y)
+                    logger.success("Acquisition #{} completed successfully", acquisition_count)
+                    
+                    elapsed = time.perf_counter() - start_time
+                    logger.debug("Acquisition took {:.2f}s", elapsed)
+                    
+                    # run at full CCD rate unless the GUI is falling behind, then
+                    # hold back to one frame per redraw
+                    min_frame_period = plot_period if self._ring.pending() > 1 else 0.0
+                    wait = min_frame_period - (time.perf_counter() - last_emit_ts)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    last_emit_ts = time.perf_counter()
+                            
+                except asyncio.TimeoutError:
+                    # a CCD stuck busy never finishes; don't leave it running
+                    self._acq_task.cancel()
+                    logger.error(f"Acquisition timed out after {acq_timeout:.0f}s")
+                    self.scan_error.emit(f"Acquisition timed out after {acq_timeout:.0f}s")
+                    return
+                except Exception as e:
+                    logger.error(f"Error in acquisition loop: {e}")
+                    self.scan_error.emit(f"Acquisition error: {e}")
+                    # scan_error is queued to the GUI thread, where
+                    # handle_scan_error runs stop_scan exactly once
+                    return
+        except asyncio.CancelledError:
+            # stop_scan already reset the GUI
+            logger.info(f"Scan cancelled after {acquisition_count} acquisitions.")
+            return
 
     @QtCore.pyqtSlot(str)
     def handle_scan_error(self, error_msg):
@@ -369,12 +522,25 @@ class LiveViewWindow(QWidget):
         logger.error(f"Scan error handler called: {error_msg}")
         self.stop_scan()
 
-    @QtCore.pyqtSlot(object, object)
+    def _poll_ring(self):
+        # leave frames in the ring while nobody can see the plot; the newest
+        # one is drawn as soon as the window is restored
+        if self.isMinimized() or not self.plot_widget.isVisible():
+            return
+        frame = self._ring.pop_latest()
+        if frame is not None:
+            self.update_plot(*frame)
+
     def update_plot(self, x_data, y_data):
         try:
             if len(x_data) > 0 and len(y_data) > 0:
-                self.latest_wavelength = np.array(x_data)
-                self.latest_intensity = np.array(y_data)
+                if x_data is not self.latest_wavelength:
+                    self.latest_wavelength = np.ascontiguousarray(x_data, dtype=np.float32)
+                # ring slots are recycled by the scan, so the plot keeps its own copy
+                if y_data is not self.latest_intensity:
+                    if self.latest_intensity is None or self.latest_intensity.size != len(y_data):
+                        self.latest_intensity = np.empty(len(y_data), dtype=np.float32)
+                    np.copyto(self.latest_intensity, y_data, casting='unsafe')
                 
                 if self.wavenumber_checkbox.isChecked():
                     x_plot = self.wavelength_to_wavenumber(self.latest_wavelength)
@@ -385,6 +551,23 @@ class LiveViewWindow(QWidget):
         except Exception as e:
             logger.warning(f"Failed to update plot: {e}")
 
+    def changeEvent(self, event):
+        if event.type() == QtCore.QEvent.WindowStateChange and not self.isMinimized():
+            self._poll_ring()
+        super().changeEvent(event)
+
+    async def _shutdown_controller(self):
+        # a cancelled scan leaves its shielded acquisition running; let it
+        # finish reading out before the devices are closed underneath it
+        task = self._acq_task
+        if task is not None and not task.done():
+            done, _ = await asyncio.wait([task], timeout=self.ACQ_DRAIN_TIMEOUT)
+            if not done:
+                logger.warning("Acquisition still running at shutdown, cancelling it.")
+                task.cancel()
+                await asyncio.wait([task])
+        await self.controller.shutdown()
+
     def closeEvent(self, event):
         logger.info("Closing application...")
         self.stop_scan()
@@ -392,10 +575,10 @@ class LiveViewWindow(QWidget):
         try:
             logger.info("Shutting down Horiba controller...")
             future = asyncio.run_coroutine_threadsafe(
-                self.controller.shutdown(), 
+                self._shutdown_controller(), 
                 self.loop
             )
-            future.result(timeout=5)
+            future.result(timeout=self.ACQ_DRAIN_TIMEOUT + 5)
             logger.info("Controller shutdown complete.")
         except Exception as e:
             logger.error(f"Error during controller shutdown: {e}")